@@ -79,6 +79,35 @@ CREATE INDEX IF NOT EXISTS idx_game_registration_tracking_classic
 COMMENT ON TABLE quizplease.game_registration_tracking IS
     'Tracks registration and poll workflow state for Quiz Please games';
 
+CREATE TABLE IF NOT EXISTS quizplease.raw_page_blobs (
+    content_sha256 CHAR(64) PRIMARY KEY,
+    compressed_body BYTEA NOT NULL,
+    raw_size INTEGER NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE IF NOT EXISTS quizplease.raw_page_fetches (
+    id BIGSERIAL PRIMARY KEY,
+    page_kind VARCHAR(20) NOT NULL,
+    game_id INTEGER,
+    url TEXT NOT NULL,
+    fetched_at TIMESTAMPTZ NOT NULL,
+    content_sha256 CHAR(64) NOT NULL
+        REFERENCES quizplease.raw_page_blobs (content_sha256)
+);
+
+CREATE INDEX IF NOT EXISTS idx_raw_page_fetches_game
+    ON quizplease.raw_page_fetches (game_id, fetched_at DESC);
+
+CREATE INDEX IF NOT EXISTS idx_raw_page_fetches_fetched_at
+    ON quizplease.raw_page_fetches (fetched_at DESC);
+
+COMMENT ON TABLE quizplease.raw_page_blobs IS
+    'Zstd-compressed raw QuizPlease page bodies, deduplicated by SHA-256 of the uncompressed body';
+
+COMMENT ON TABLE quizplease.raw_page_fetches IS
+    'Index of archived schedule and game page fetches for offline re-parsing';
+
 CREATE OR REPLACE VIEW quizplease.game_registration_overview AS
 SELECT
     g.id AS game_id,
@@ -1,6 +1,9 @@
+import json
 import logging
 import os
 import re
+import sys
+from contextlib import contextmanager
 from functools import wraps
 from time import sleep
 
@@ -9,6 +12,8 @@ import requests as req
 from bs4 import BeautifulSoup
 
 from game_details import parse_game_page_html
+from page_archive import PAGE_KIND_GAME, PAGE_KIND_SCHEDULE, get_page_archive
+from profiling import profile_call, profile_options
 from postgres_store import get_db_connection, select_tracked_game_ids, upsert_game_and_tracking
 
 
@@ -91,7 +96,32 @@ def ensure_schedule_visited():
         logger.warning("Failed to pre-visit schedule page: %s", exc)
 
 
-def get_game_ids(url):
+@contextmanager
+def open_page_archive():
+    try:
+        archive = get_page_archive()
+    except Exception as exc:
+        logger.warning("Page archive is disabled: %s", exc)
+        archive = None
+
+    try:
+        yield archive
+    finally:
+        if archive is not None:
+            archive.close()
+
+
+def archive_page(archive, page_kind, url, body, game_id=None):
+    if archive is None:
+        return
+
+    try:
+        archive.store(page_kind, url, body, game_id=game_id)
+    except Exception as exc:
+        logger.warning("Failed to archive %s page %s: %s", page_kind, url, exc)
+
+
+def get_game_ids(url, archive=None):
     global _schedule_visited
     try:
         page = session.get(url)
@@ -102,6 +132,8 @@ def get_game_ids(url):
         logger.error("Failed to get game IDs from the registration page: %s", exc)
         return [], []
 
+    archive_page(archive, PAGE_KIND_SCHEDULE, url, page.content)
+
     soup = BeautifulSoup(page.content, "html.parser")
     classic_game_ids = []
     other_game_ids = []
@@ -130,13 +162,16 @@ def get_game_ids(url):
 
 
 @retry_on_failure(max_attempts=5, delay_seconds=60)
-def get_game_details(game_id):
+def get_game_details(game_id, archive=None):
     ensure_schedule_visited()
 
-    page = session.get(GAME_PAGE_URL_TEMPLATE.format(game_id))
+    url = GAME_PAGE_URL_TEMPLATE.format(game_id)
+    page = session.get(url)
     page.raise_for_status()
     sleep(2)
 
+    archive_page(archive, PAGE_KIND_GAME, url, page.content, game_id=int(game_id))
+
     game = parse_game_page_html(page.content, int(game_id))
     if not game.get("game_type"):
         raise ValueError(f"Could not derive game_type for game {game_id}")
@@ -197,6 +232,23 @@ def store_game(conn, game, *, registered_on=None, poll_created=False, poll_date=
 
 
 def lambda_handler(event, context):
+    options = profile_options(event.get("profile"))
+    if options is None:
+        return process_event(event, context)
+
+    logger.info("Profiling enabled: %s", options)
+    result, report = profile_call(
+        process_event,
+        event,
+        context,
+        traced=[(sys.modules[__name__], "get_game_ids"), (sys.modules[__name__], "parse_game_page_html")],
+        **options,
+    )
+    logger.info("Profile report: %s", json.dumps(report, ensure_ascii=False))
+    return {**result, "profile": report}
+
+
+def process_event(event, context):
     logger.info("Starting")
 
     if "game_ids" not in event:
@@ -205,7 +257,7 @@ def lambda_handler(event, context):
     manual_game_ids = [str(x) for x in event["game_ids"]]
     is_manual_run = bool(manual_game_ids)
 
-    with get_db_connection() as conn:
+    with get_db_connection() as conn, open_page_archive() as archive:
         conn.autocommit = False
 
         if is_manual_run:
@@ -229,7 +281,7 @@ def lambda_handler(event, context):
                 for game_id in new_manual_game_ids:
                     try:
                         register(game_id)
-                        game = get_game_details(game_id)
+                        game = get_game_details(game_id, archive=archive)
                         store_game(
                             conn,
                             game,
@@ -261,7 +313,7 @@ def lambda_handler(event, context):
 
         else:
             logger.info("Scheduled run")
-            classic_game_ids, other_game_ids = get_game_ids(SCHEDULE_URL)
+            classic_game_ids, other_game_ids = get_game_ids(SCHEDULE_URL, archive=archive)
 
             with conn.cursor() as cur:
                 saved_registered_ids = select_tracked_game_ids(cur, only_registered=True)
@@ -281,7 +333,7 @@ def lambda_handler(event, context):
                 for game_id in new_classic_game_ids:
                     try:
                         register(game_id)
-                        game = get_game_details(game_id)
+                        game = get_game_details(game_id, archive=archive)
                         store_game(
                             conn,
                             game,
@@ -320,7 +372,7 @@ def lambda_handler(event, context):
 
                     for game_id in new_other_game_ids:
                         try:
-                            game = get_game_details(game_id)
+                            game = get_game_details(game_id, archive=archive)
                             store_game(conn, game, registered_on=None, poll_created=False)
                             conn.commit()
                             next_week_games.append(
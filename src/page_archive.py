@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import io
+import json
+import mmap
+import os
+import sys
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Iterator
+
+from postgres_store import get_db_connection, insert_raw_page, select_raw_page_blob, select_raw_page_fetches
+
+
+ARCHIVE_BACKEND_ENV = "PAGE_ARCHIVE_BACKEND"
+ARCHIVE_DIR_ENV = "PAGE_ARCHIVE_DIR"
+ZSTD_LEVEL = 10
+
+PAGE_KIND_SCHEDULE = "schedule"
+PAGE_KIND_GAME = "game"
+
+
+@dataclass(frozen=True)
+class ArchivedPage:
+    page_kind: str
+    game_id: int | None
+    url: str
+    fetched_at: str
+    content_sha256: str
+
+
+def _zstd():
+    try:
+        import zstandard
+    except ModuleNotFoundError as exc:
+        raise RuntimeError(
+            "zstandard is not installed. Install src/requirements.txt before enabling the page archive."
+        ) from exc
+
+    return zstandard
+
+
+def compress_page(body: bytes) -> bytes:
+    return _zstd().ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+class DirectoryPageArchive:
+    def __init__(self, root: str | os.PathLike[str]):
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.index_path = self.root / "index.jsonl"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+
+    def _object_path(self, content_sha256: str) -> Path:
+        return self.objects_dir / content_sha256[:2] / f"{content_sha256}.zst"
+
+    def store(self, page_kind: str, url: str, body: bytes, game_id: int | None = None) -> str:
+        content_sha256 = hashlib.sha256(body).hexdigest()
+        object_path = self._object_path(content_sha256)
+
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = object_path.with_suffix(f".{os.getpid()}.tmp")
+            tmp_path.write_bytes(compress_page(body))
+            os.replace(tmp_path, object_path)
+
+        page = ArchivedPage(page_kind, game_id, url, utc_now(), content_sha256)
+        with self.index_path.open("a", encoding="utf-8") as index:
+            index.write(json.dumps(asdict(page), ensure_ascii=False) + "\n")
+        return content_sha256
+
+    def iter_pages(self, game_id: int | None = None) -> Iterator[ArchivedPage]:
+        if not self.index_path.exists():
+            return
+
+        with self.index_path.open(encoding="utf-8") as index:
+            for line in index:
+                if not line.strip():
+                    continue
+                page = ArchivedPage(**json.loads(line))
+                if game_id is None or page.game_id == game_id:
+                    yield page
+
+    @contextmanager
+    def open_body(self, content_sha256: str) -> Iterator[BinaryIO]:
+        with self._object_path(content_sha256).open("rb") as fh:
+            with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                with _zstd().ZstdDecompressor().stream_reader(mapped) as reader:
+                    yield reader
+
+    def read_body(self, content_sha256: str) -> bytes:
+        with self.open_body(content_sha256) as reader:
+            return reader.read()
+
+    def close(self) -> None:
+        pass
+
+
+class PostgresPageArchive:
+    def __init__(self, conn):
+        self.conn = conn
+
+    def store(self, page_kind: str, url: str, body: bytes, game_id: int | None = None) -> str:
+        content_sha256 = hashlib.sha256(body).hexdigest()
+        with self.conn.cursor() as cur:
+            insert_raw_page(
+                cur,
+                page_kind=page_kind,
+                game_id=game_id,
+                url=url,
+                fetched_at=utc_now(),
+                content_sha256=content_sha256,
+                compressed_body=compress_page(body),
+                raw_size=len(body),
+            )
+        return content_sha256
+
+    def iter_pages(self, game_id: int | None = None) -> Iterator[ArchivedPage]:
+        with self.conn.cursor() as cur:
+            rows = select_raw_page_fetches(cur, game_id)
+        for page_kind, row_game_id, url, fetched_at, content_sha256 in rows:
+            yield ArchivedPage(page_kind, row_game_id, url, fetched_at.isoformat(), content_sha256.strip())
+
+    @contextmanager
+    def open_body(self, content_sha256: str) -> Iterator[BinaryIO]:
+        with self.conn.cursor() as cur:
+            compressed_body = select_raw_page_blob(cur, content_sha256)
+        if compressed_body is None:
+            raise FileNotFoundError(f"No archived page with hash {content_sha256}")
+
+        with _zstd().ZstdDecompressor().stream_reader(io.BytesIO(compressed_body)) as reader:
+            yield reader
+
+    def read_body(self, content_sha256: str) -> bytes:
+        with self.open_body(content_sha256) as reader:
+            return reader.read()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+def get_page_archive(
+    backend: str | None = None,
+    directory: str | None = None,
+) -> DirectoryPageArchive | PostgresPageArchive | None:
+    backend = (backend if backend is not None else os.environ.get(ARCHIVE_BACKEND_ENV, "")).strip().lower()
+    if not backend:
+        return None
+
+    if backend == "directory":
+        return DirectoryPageArchive(directory or os.environ[ARCHIVE_DIR_ENV])
+
+    if backend == "postgres":
+        # A dedicated autocommit connection keeps archived pages even when the
+        # game transaction on the main connection is rolled back.
+        conn = get_db_connection()
+        conn.autocommit = True
+        return PostgresPageArchive(conn)
+
+    raise ValueError(f"Unknown {ARCHIVE_BACKEND_ENV} value: {backend}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Inspect and re-parse archived QuizPlease pages offline.")
+    parser.add_argument("--backend", help=f"Archive backend, defaults to ${ARCHIVE_BACKEND_ENV}")
+    parser.add_argument("--dir", help=f"Archive directory, defaults to ${ARCHIVE_DIR_ENV}")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = subparsers.add_parser("list", help="List archived fetches")
+    list_parser.add_argument("--game-id", type=int)
+
+    cat_parser = subparsers.add_parser("cat", help="Write a decompressed page body to stdout")
+    cat_parser.add_argument("content_sha256")
+
+    reparse_parser = subparsers.add_parser("reparse", help="Re-parse archived game pages")
+    reparse_parser.add_argument("--game-id", type=int)
+
+    args = parser.parse_args(argv)
+    archive = get_page_archive(args.backend, args.dir)
+    if archive is None:
+        parser.error(f"Set --backend or ${ARCHIVE_BACKEND_ENV}")
+
+    try:
+        if args.command == "list":
+            for page in archive.iter_pages(args.game_id):
+                print(json.dumps(asdict(page), ensure_ascii=False))
+
+        elif args.command == "cat":
+            with archive.open_body(args.content_sha256) as reader:
+                while chunk := reader.read(65536):
+                    sys.stdout.buffer.write(chunk)
+
+        elif args.command == "reparse":
+            from game_details import parse_game_page_html
+
+            exit_code = 0
+            for page in archive.iter_pages(args.game_id):
+                if page.page_kind != PAGE_KIND_GAME or page.game_id is None:
+                    continue
+                try:
+                    details = parse_game_page_html(archive.read_body(page.content_sha256), page.game_id)
+                    result = {"fetched_at": page.fetched_at, "details": details}
+                except ValueError as exc:
+                    result = {"fetched_at": page.fetched_at, "game_id": page.game_id, "error": str(exc)}
+                    exit_code = 1
+                print(json.dumps(result, ensure_ascii=False))
+            return exit_code
+    finally:
+        archive.close()
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
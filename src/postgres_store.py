@@ -115,6 +115,39 @@ SET
 """
 
 
+INSERT_RAW_PAGE_BLOB_SQL = """
+INSERT INTO quizplease.raw_page_blobs (
+    content_sha256,
+    compressed_body,
+    raw_size
+)
+VALUES (
+    %(content_sha256)s,
+    %(compressed_body)s,
+    %(raw_size)s
+)
+ON CONFLICT (content_sha256) DO NOTHING
+"""
+
+
+INSERT_RAW_PAGE_FETCH_SQL = """
+INSERT INTO quizplease.raw_page_fetches (
+    page_kind,
+    game_id,
+    url,
+    fetched_at,
+    content_sha256
+)
+VALUES (
+    %(page_kind)s,
+    %(game_id)s,
+    %(url)s,
+    %(fetched_at)s,
+    %(content_sha256)s
+)
+"""
+
+
 def get_db_connection():
     try:
         import psycopg2
@@ -181,3 +214,69 @@ def upsert_game_and_tracking(
             "poll_date": poll_date if registered_on is not None else None,
         },
     )
+
+
+def insert_raw_page(
+    cur,
+    *,
+    page_kind: str,
+    game_id: int | None,
+    url: str,
+    fetched_at: str,
+    content_sha256: str,
+    compressed_body: bytes,
+    raw_size: int,
+) -> None:
+    cur.execute(
+        INSERT_RAW_PAGE_BLOB_SQL,
+        {
+            "content_sha256": content_sha256,
+            "compressed_body": compressed_body,
+            "raw_size": raw_size,
+        },
+    )
+    cur.execute(
+        INSERT_RAW_PAGE_FETCH_SQL,
+        {
+            "page_kind": page_kind,
+            "game_id": game_id,
+            "url": url,
+            "fetched_at": fetched_at,
+            "content_sha256": content_sha256,
+        },
+    )
+
+
+def select_raw_page_fetches(cur, game_id: int | None = None) -> list[tuple[Any, ...]]:
+    if game_id is None:
+        cur.execute(
+            """
+            SELECT page_kind, game_id, url, fetched_at, content_sha256
+            FROM quizplease.raw_page_fetches
+            ORDER BY fetched_at, id
+            """
+        )
+    else:
+        cur.execute(
+            """
+            SELECT page_kind, game_id, url, fetched_at, content_sha256
+            FROM quizplease.raw_page_fetches
+            WHERE game_id = %(game_id)s
+            ORDER BY fetched_at, id
+            """,
+            {"game_id": game_id},
+        )
+    return cur.fetchall()
+
+
+def select_raw_page_blob(cur, content_sha256: str) -> bytes | None:
+    cur.execute(
+        """
+        SELECT compressed_body
+        FROM quizplease.raw_page_blobs
+        WHERE content_sha256 = %(content_sha256)s
+        """,
+        {"content_sha256": content_sha256},
+    )
+    row = cur.fetchone()
+    return bytes(row[0]) if row else None
@@ -0,0 +1,212 @@
+from __future__ import annotations
+
+import cProfile
+import glob
+import json
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from functools import wraps
+from types import FrameType, ModuleType
+from typing import Any, Callable, Iterable
+
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TOP = 15
+TRACEMALLOC_FRAMES = 10
+SOURCE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Lambda dependencies are vendored into the same directory, so only its
+# top-level modules (minus this one) count as our own code.
+SOURCE_FILES = frozenset(glob.glob(os.path.join(SOURCE_DIR, "*.py"))) - {os.path.abspath(__file__)}
+
+
+def profile_options(value: Any) -> dict[str, Any] | None:
+    if not value:
+        return None
+
+    options: dict[str, Any] = {"top": DEFAULT_TOP, "sample_interval_ms": None}
+    if isinstance(value, dict):
+        if value.get("top"):
+            options["top"] = int(value["top"])
+        if value.get("sample_interval_ms"):
+            options["sample_interval_ms"] = float(value["sample_interval_ms"])
+    return options
+
+
+def _frame_label(frame: FrameType) -> str:
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{frame.f_lineno}({code.co_name})"
+
+
+class StackSampler:
+    def __init__(self, thread_id: int, interval_ms: float):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.samples = 0
+        self.leaf_counts: Counter[str] = Counter()
+        self.source_counts: Counter[str] = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+
+            self.samples += 1
+            self.leaf_counts[_frame_label(frame)] += 1
+            # The innermost frame from our own sources shows which step of the
+            # register/fetch loops is waiting, e.g. a sleep() or session.get().
+            while frame is not None and frame.f_code.co_filename not in SOURCE_FILES:
+                frame = frame.f_back
+            if frame is not None:
+                self.source_counts[_frame_label(frame)] += 1
+
+    def report(self, top: int) -> dict[str, Any]:
+        def shares(counts: Counter[str]) -> list[dict[str, Any]]:
+            return [
+                {"frame": label, "samples": count, "share": round(count / max(self.samples, 1), 3)}
+                for label, count in counts.most_common(top)
+            ]
+
+        return {
+            "interval_ms": self.interval * 1000,
+            "samples": self.samples,
+            "leaf_frames": shares(self.leaf_counts),
+            "source_frames": shares(self.source_counts),
+        }
+
+
+class AllocationTracker:
+    def __init__(self):
+        self.functions: dict[str, dict[str, Any]] = {}
+        self.peak_bytes = 0
+        self._patched: list[tuple[ModuleType, str, Callable[..., Any]]] = []
+
+    def observe_peak(self) -> None:
+        self.peak_bytes = max(self.peak_bytes, tracemalloc.get_traced_memory()[1])
+
+    def _wrap(self, func: Callable[..., Any]) -> Callable[..., Any]:
+        stats = self.functions.setdefault(func.__name__, {"calls": 0, "max_peak_kib": 0.0, "total_peak_kib": 0.0})
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            # reset_peak() is global, so fold the running peak into the overall
+            # figure before measuring this call in isolation.
+            self.observe_peak()
+            tracemalloc.reset_peak()
+            start = tracemalloc.get_traced_memory()[0]
+            try:
+                return func(*args, **kwargs)
+            finally:
+                call_peak_kib = (tracemalloc.get_traced_memory()[1] - start) / 1024
+                self.observe_peak()
+                stats["calls"] += 1
+                stats["max_peak_kib"] = round(max(stats["max_peak_kib"], call_peak_kib), 1)
+                stats["total_peak_kib"] = round(stats["total_peak_kib"] + call_peak_kib, 1)
+
+        return wrapper
+
+    def patch(self, targets: Iterable[tuple[ModuleType, str]]) -> None:
+        for module, name in targets:
+            original = getattr(module, name)
+            self._patched.append((module, name, original))
+            setattr(module, name, self._wrap(original))
+
+    def restore(self) -> None:
+        while self._patched:
+            module, name, original = self._patched.pop()
+            setattr(module, name, original)
+
+
+def _top_functions(profiler: cProfile.Profile, top: int) -> list[dict[str, Any]]:
+    stats = pstats.Stats(profiler).sort_stats(pstats.SortKey.CUMULATIVE)
+    rows = []
+    for filename, lineno, name in stats.fcn_list[:top]:
+        _, total_calls, own_time, cumulative_time, _ = stats.stats[(filename, lineno, name)]
+        rows.append(
+            {
+                "function": f"{os.path.basename(filename)}:{lineno}({name})",
+                "calls": total_calls,
+                "tottime_s": round(own_time, 4),
+                "cumtime_s": round(cumulative_time, 4),
+            }
+        )
+    return rows
+
+
+def _top_allocations(snapshot: tracemalloc.Snapshot, top: int) -> list[dict[str, Any]]:
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(True, path, all_frames=True) for path in SOURCE_FILES])
+    return [
+        {
+            "line": f"{os.path.basename(stat.traceback[0].filename)}:{stat.traceback[0].lineno}",
+            "size_kib": round(stat.size / 1024, 1),
+            "count": stat.count,
+        }
+        for stat in snapshot.statistics("lineno")[:top]
+    ]
+
+
+def profile_call(
+    func: Callable[..., Any],
+    *args: Any,
+    top: int = DEFAULT_TOP,
+    sample_interval_ms: float | None = None,
+    traced: Iterable[tuple[ModuleType, str]] = (),
+    **kwargs: Any,
+) -> tuple[Any, dict[str, Any]]:
+    profiler = cProfile.Profile()
+    tracker = AllocationTracker()
+    sampler = StackSampler(threading.get_ident(), sample_interval_ms) if sample_interval_ms else None
+
+    tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracker.patch(traced)
+    if sampler is not None:
+        sampler.start()
+
+    started = time.perf_counter()
+    failed = True
+    try:
+        profiler.enable()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            profiler.disable()
+        failed = False
+    finally:
+        elapsed = time.perf_counter() - started
+        if sampler is not None:
+            sampler.stop()
+        tracker.restore()
+        tracker.observe_peak()
+        snapshot = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+        report = {
+            "wall_time_s": round(elapsed, 3),
+            "peak_memory_kib": round(tracker.peak_bytes / 1024, 1),
+            "top_cumulative": _top_functions(profiler, top),
+            "traced_functions": tracker.functions,
+            "retained_allocations": _top_allocations(snapshot, top),
+        }
+        if sampler is not None:
+            report["sampling"] = sampler.report(top)
+
+        if failed:
+            logger.warning("Profiled call failed, partial profile report: %s", json.dumps(report, ensure_ascii=False))
+
+    return result, report
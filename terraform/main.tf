@@ -73,6 +73,9 @@ resource "aws_lambda_function" "game_reg" {
       BOT_TOKEN      = var.bot_token
       GROUP_ID       = var.group_id
       ADMIN_CHAT_ID  = var.admin_chat_id != "" ? var.admin_chat_id : var.group_id
+
+      PAGE_ARCHIVE_BACKEND = var.page_archive_backend
+      PAGE_ARCHIVE_DIR     = var.page_archive_dir
     }
   }
 
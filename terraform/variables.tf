@@ -81,6 +81,18 @@ variable "admin_chat_id" {
   default     = ""
 }
 
+variable "page_archive_backend" {
+  type        = string
+  description = "Raw page archive backend: \"postgres\", \"directory\" or empty to disable archiving"
+  default     = ""
+}
+
+variable "page_archive_dir" {
+  type        = string
+  description = "Root directory for the \"directory\" page archive backend"
+  default     = ""
+}
+
 variable "resource_name" {
   description = "The prefix for all resource names"
   type        = string